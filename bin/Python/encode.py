@@ -0,0 +1,270 @@
+import argparse
+import fnmatch
+import gzip
+import hashlib
+import json
+import os
+import secrets
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from embed import deriveKey, embedFile, to_c_array
+
+## Batch encoder: turns a directory of ESPHome YAML files into config blobs
+## (readable by decode.py) and C arrays (as embedded by the component), without
+## running an ESPHome compile per device.
+
+CACHE_FILENAME = ".encode-cache.json"
+ENCRYPTION_TYPES = ["none", "xor", "aes256"]
+COMPRESSION_TYPES = ["none", "gzip"]
+SETTINGS_KEYS = ["encryption", "key", "compression"]
+
+# ProcessPoolExecutor refuses more than 61 workers on Windows.
+MAX_JOBS = 61 if sys.platform == "win32" else None
+
+
+def load_manifest(path: str) -> dict:
+    """
+    Load a JSON manifest of per-file settings. Example:
+        {
+          "defaults": {"encryption": "aes256", "key": "fleetkey"},
+          "files": {"kitchen.yaml": {"key": "kitchenkey"}}
+        }
+    File entries are matched against the path relative to the input directory
+    and may be glob patterns; later matches override earlier ones.
+    """
+    if not path:
+        return {"defaults": {}, "files": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if not isinstance(manifest, dict):
+        raise ValueError("manifest must be a JSON object")
+    manifest.setdefault("defaults", {})
+    manifest.setdefault("files", {})
+    if not isinstance(manifest["defaults"], dict) or not isinstance(manifest["files"], dict):
+        raise ValueError("'defaults' and 'files' must be JSON objects")
+    if not all(isinstance(overrides, dict) for overrides in manifest["files"].values()):
+        raise ValueError("every entry in 'files' must be a JSON object")
+    return manifest
+
+
+def settings_for(rel_path: str, manifest: dict, args) -> dict:
+    settings = {"encryption": args.encryption, "key": args.key, "compression": args.compression}
+    settings.update(manifest["defaults"])
+    for pattern, overrides in manifest["files"].items():
+        if rel_path == pattern or fnmatch.fnmatch(rel_path, pattern):
+            settings.update(overrides)
+
+    unknown = sorted(set(settings) - set(SETTINGS_KEYS))
+    if unknown:
+        raise ValueError(f"{rel_path}: unknown manifest settings {', '.join(unknown)}")
+    for name in SETTINGS_KEYS:
+        value = settings[name]
+        if not (isinstance(value, str) or (name == "key" and value is None)):
+            raise ValueError(f"{rel_path}: '{name}' must be a string, got {type(value).__name__}")
+    if settings["encryption"] not in ENCRYPTION_TYPES:
+        raise ValueError(f"{rel_path}: unsupported encryption type '{settings['encryption']}'")
+    if settings["compression"] not in COMPRESSION_TYPES:
+        raise ValueError(f"{rel_path}: unsupported compression type '{settings['compression']}'")
+    if settings["encryption"] != "none" and not settings["key"]:
+        raise ValueError(f"{rel_path}: encryption {settings['encryption']} requires a key")
+    return settings
+
+
+def key_digest(key: str, salt: bytes) -> bytes:
+    """
+    Stretch a key with the same PBKDF2 parameters used for the blobs and the
+    cache's random salt, so guessing keys from the cache is no cheaper than
+    guessing them from the blobs. Executed in a worker process.
+    """
+    if not key:
+        return b""
+    return deriveKey(key, salt)
+
+
+def fingerprint(path: str, settings: dict, stretched_key: bytes) -> str:
+    """
+    Hash the file content together with the settings used to encode it, so a
+    changed config or a rotated key forces re-encoding. Only the salted PBKDF2
+    output of the key (see key_digest) goes into the hash.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        digest.update(f.read())
+    digest.update(settings["encryption"].encode("utf-8"))
+    digest.update(settings["compression"].encode("utf-8"))
+    digest.update(stretched_key)
+    return digest.hexdigest()
+
+
+def output_paths(output_dir: str, rel_path: str) -> (str, str):
+    stem = os.path.splitext(rel_path)[0]
+    return (os.path.join(output_dir, stem + ".b64"),
+            os.path.join(output_dir, stem + ".h"))
+
+
+def encode_one(path: str, blob_path: str, header_path: str, settings: dict) -> int:
+    """
+    Run the embed pipeline for a single file and write its outputs.
+    Executed in a worker process; returns the size of the embedded C array.
+    """
+    # Same steps as the component, stopping before the final gzip so the blob
+    # stays decodable by decode.py. The C array gets the final gzip on top.
+    blob = embedFile(
+        path=path,
+        read_mode='binary',
+        add_filename_comment=True,
+        compress_first=settings["compression"] == "gzip",
+        encrypt=settings["encryption"],
+        key=settings["key"],
+        final_base64=True,
+        compress_after_b64=False
+    )
+    embedded = gzip.compress(blob)
+
+    os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+    with open(blob_path, "wb") as out:
+        out.write(blob)
+    with open(header_path, "w", encoding="utf-8") as out:
+        out.write(to_c_array(embedded, "CONFIG_B64") + "\n")
+    return len(embedded)
+
+
+def find_configs(input_dir: str, patterns: list) -> list:
+    found = []
+    for root, dirs, files in os.walk(input_dir):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for name in sorted(files):
+            if any(fnmatch.fnmatch(name, p) for p in patterns):
+                found.append(os.path.relpath(os.path.join(root, name), input_dir))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch encode ESPHome configs into config.b64 blobs and C arrays")
+    parser.add_argument("input", help="Directory containing the YAML configs")
+    parser.add_argument("output", help="Directory to write <name>.b64 and <name>.h files to")
+    parser.add_argument("--manifest", help="JSON manifest with per-file encryption, key and compression")
+    parser.add_argument("--key", help="Default encryption key (overridden by the manifest)")
+    parser.add_argument("--encryption", choices=ENCRYPTION_TYPES, default="none",
+                        help="Default encryption type (default: none)")
+    parser.add_argument("--compression", choices=COMPRESSION_TYPES, default="gzip",
+                        help="Default compression type (default: gzip)")
+    parser.add_argument("--pattern", action="append",
+                        help="Filename glob to encode, may be repeated (default: *.yaml, *.yml)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument("-f", "--force", action="store_true",
+                        help="Re-encode every file, ignoring the cache of unchanged files")
+
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.input):
+        print(f"[!] Error: input directory not found: {args.input}")
+        sys.exit(1)
+
+    try:
+        manifest = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"[!] Failed to load manifest: {e}")
+        sys.exit(1)
+
+    configs = find_configs(args.input, args.pattern or ["*.yaml", "*.yml"])
+    if not configs:
+        print(f"[!] No configs found in {args.input}")
+        sys.exit(1)
+
+    # Inputs sharing a stem (e.g. c.yaml and c.yml) would overwrite each other's output.
+    outputs = {}
+    for rel_path in configs:
+        outputs.setdefault(output_paths(args.output, rel_path)[0], []).append(rel_path)
+    collisions = [sources for sources in outputs.values() if len(sources) > 1]
+    if collisions:
+        for sources in collisions:
+            print(f"[!] Error: {', '.join(sources)} would write the same output files")
+        sys.exit(1)
+
+    # The cache holds {"salt": <hex>, "files": {<rel_path>: <fingerprint>}}.
+    cache_path = os.path.join(args.output, CACHE_FILENAME)
+    salt, cache = None, {}
+    if not args.force and os.path.exists(cache_path):
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            if not isinstance(stored, dict) or not isinstance(stored.get("files"), dict):
+                raise ValueError("unrecognised format")
+            salt, cache = bytes.fromhex(stored["salt"]), stored["files"]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"[!] Ignoring unreadable cache {cache_path} ({e}), re-encoding everything")
+            salt, cache = None, {}
+    if salt is None:
+        salt = secrets.token_bytes(16)
+
+    settings = {}
+    for rel_path in configs:
+        try:
+            settings[rel_path] = settings_for(rel_path, manifest, args)
+        except ValueError as e:
+            print(f"[!] Error: {e}")
+            sys.exit(1)
+
+    workers = max(1, args.jobs)
+    if MAX_JOBS:
+        workers = min(workers, MAX_JOBS)
+
+    failed = 0
+    jobs = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Stretch each distinct key once, in parallel, before comparing fingerprints.
+        keys = sorted({file_settings["key"] for file_settings in settings.values() if file_settings["key"]})
+        stretched = dict(zip(keys, pool.map(key_digest, keys, [salt] * len(keys))))
+
+        # Work out which files actually need encoding.
+        skipped = 0
+        for rel_path in configs:
+            path = os.path.join(args.input, rel_path)
+            file_settings = settings[rel_path]
+            digest = fingerprint(path, file_settings, stretched.get(file_settings["key"], b""))
+            blob_path, header_path = output_paths(args.output, rel_path)
+            if cache.get(rel_path) == digest and os.path.exists(blob_path) and os.path.exists(header_path):
+                skipped += 1
+                continue
+            jobs[rel_path] = (path, blob_path, header_path, file_settings, digest)
+
+        print(f"[*] {len(configs)} configs found, {skipped} unchanged, {len(jobs)} to encode")
+
+        if jobs:
+            os.makedirs(args.output, exist_ok=True)
+            futures = {
+                pool.submit(encode_one, path, blob_path, header_path, file_settings): rel_path
+                for rel_path, (path, blob_path, header_path, file_settings, _) in jobs.items()
+            }
+            for future in as_completed(futures):
+                rel_path = futures[future]
+                try:
+                    size = future.result()
+                except Exception as e:
+                    print(f"[!] {rel_path}: {e}")
+                    cache.pop(rel_path, None)
+                    failed += 1
+                    continue
+                cache[rel_path] = jobs[rel_path][4]
+                print(f"[+] {rel_path} ({jobs[rel_path][3]['encryption']}, {size} bytes embedded)")
+
+    # Forget files that no longer exist in the input directory.
+    cache = {rel_path: digest for rel_path, digest in cache.items() if rel_path in configs}
+    os.makedirs(args.output, exist_ok=True)
+    # Write then rename, so an interrupted run never leaves a truncated cache behind.
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"salt": salt.hex(), "files": cache}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, cache_path)
+
+    if failed:
+        print(f"[!] {failed} configs failed to encode")
+        sys.exit(1)
+    print(f"[+] Wrote {len(jobs)} configs to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,10 +5,22 @@
  * @brief Provides backup and retrieval of ESPHome configuration data, including optional javascript
  */
 
+#include <atomic>
+#include <cinttypes>
+
 #include "esphome/core/component.h"
 #include "esphome/core/defines.h"
+#include "esphome/core/hal.h"
+#include "esphome/core/log.h"
 #include "esphome/components/web_server_base/web_server_base.h"
 
+#ifdef USE_SENSOR
+  #include "esphome/components/sensor/sensor.h"
+#endif
+#ifdef USE_TEXT_SENSOR
+  #include "esphome/components/text_sensor/text_sensor.h"
+#endif
+
 #ifndef ESPHOME_CONFIG_BACKUP_NOJS
   /**
    * @brief JavaScript (GZipped) used to handle client-side decryption of configuration data.
@@ -28,12 +40,22 @@ namespace config_backup {
 
 using namespace web_server_base;
 
+static const char *const TAG = "config_backup";
+
+/**
+ * @brief Identifies which route was served most recently.
+ */
+enum ServedPath : uint8_t {
+  SERVED_PATH_NONE = 0,
+  SERVED_PATH_CONFIG,
+  SERVED_PATH_JAVASCRIPT,
+};
 
 /**
  * @class ConfigBackup
  * @brief Manages retrieval of the configuration data and optional decryption script via web server routes.
  */
-class ConfigBackup : public esphome::Component, public AsyncWebHandler {
+class ConfigBackup : public esphome::PollingComponent, public AsyncWebHandler {
  public:
   /**
    * @brief Constructor that optionally attaches this handler (and the middleware) to the given web server base.
@@ -46,14 +68,91 @@ class ConfigBackup : public esphome::Component, public AsyncWebHandler {
   }
 
   /**
-   * @brief Called during setup, but no special initialization is needed here.
+   * @brief Publishes the build-time encryption and compression settings, which never change at runtime.
    */
-  void setup() override {}
+  void setup() override {
+    #ifdef USE_TEXT_SENSOR
+      if (this->encryption_text_sensor_ != nullptr)
+        this->encryption_text_sensor_->publish_state(this->encryption.c_str());
+      if (this->compression_text_sensor_ != nullptr)
+        this->compression_text_sensor_->publish_state(this->compression.c_str());
+    #endif
+  }
 
   /**
    * @brief Prints diagnostic information during the ESPHome dump_config phase.
    */
-  void dump_config() override {}
+  void dump_config() override {
+    ESP_LOGCONFIG(TAG, "Config Backup:");
+    ESP_LOGCONFIG(TAG, "  Config Path: %s", this->config_path.c_str());
+    ESP_LOGCONFIG(TAG, "  Encryption: %s", this->encryption.c_str());
+    ESP_LOGCONFIG(TAG, "  Compression: %s", this->compression.c_str());
+    ESP_LOGCONFIG(TAG, "  Config Payload Size: %u bytes", (unsigned) CONFIG_B64_SIZE);
+    #ifndef ESPHOME_CONFIG_BACKUP_NOJS
+      ESP_LOGCONFIG(TAG, "  JavaScript Payload Size: %u bytes", (unsigned) CONFIG_DECRYPT_JS_SIZE);
+    #else
+      ESP_LOGCONFIG(TAG, "  JavaScript: remote");
+    #endif
+    ESP_LOGCONFIG(TAG, "  ETag: %s", this->etag.c_str());
+    ESP_LOGCONFIG(TAG, "  Requests Served: %" PRIu32 " config, %" PRIu32 " javascript, %" PRIu32 " not modified",
+                  this->config_requests_.load(), this->javascript_requests_.load(),
+                  this->not_modified_.load());
+    ESP_LOGCONFIG(TAG, "  Bytes Sent: %" PRIu32, this->bytes_sent_.load());
+    LOG_UPDATE_INTERVAL(this);
+    #ifdef USE_SENSOR
+      LOG_SENSOR("  ", "Config Requests", this->config_requests_sensor_);
+      LOG_SENSOR("  ", "JavaScript Requests", this->javascript_requests_sensor_);
+      LOG_SENSOR("  ", "Not Modified", this->not_modified_sensor_);
+      LOG_SENSOR("  ", "Bytes Sent", this->bytes_sent_sensor_);
+      LOG_SENSOR("  ", "Last Duration", this->last_duration_sensor_);
+      LOG_SENSOR("  ", "Max Duration", this->max_duration_sensor_);
+      LOG_SENSOR("  ", "Active Transfers", this->active_transfers_sensor_);
+    #endif
+    #ifdef USE_TEXT_SENSOR
+      LOG_TEXT_SENSOR("  ", "Encryption", this->encryption_text_sensor_);
+      LOG_TEXT_SENSOR("  ", "Compression", this->compression_text_sensor_);
+      LOG_TEXT_SENSOR("  ", "Last Path", this->last_path_text_sensor_);
+    #endif
+  }
+
+  /**
+   * @brief Publishes the collected request metrics to any configured sensors.
+   *
+   * Counters are written from the web server's task, so publishing is deferred to
+   * the main loop here rather than done inside handleRequest().
+   */
+  void update() override {
+    #ifdef USE_SENSOR
+      if (this->config_requests_sensor_ != nullptr)
+        this->config_requests_sensor_->publish_state(this->config_requests_.load());
+      if (this->javascript_requests_sensor_ != nullptr)
+        this->javascript_requests_sensor_->publish_state(this->javascript_requests_.load());
+      if (this->not_modified_sensor_ != nullptr)
+        this->not_modified_sensor_->publish_state(this->not_modified_.load());
+      if (this->bytes_sent_sensor_ != nullptr)
+        this->bytes_sent_sensor_->publish_state(this->bytes_sent_.load());
+      if (this->last_duration_sensor_ != nullptr)
+        this->last_duration_sensor_->publish_state(this->last_duration_us_.load() / 1000.0f);
+      if (this->max_duration_sensor_ != nullptr)
+        this->max_duration_sensor_->publish_state(this->max_duration_us_.load() / 1000.0f);
+      if (this->active_transfers_sensor_ != nullptr)
+        this->active_transfers_sensor_->publish_state(this->active_transfers_.load());
+    #endif
+    #ifdef USE_TEXT_SENSOR
+      if (this->last_path_text_sensor_ != nullptr) {
+        switch (this->last_path_.load()) {
+          case SERVED_PATH_CONFIG:
+            this->last_path_text_sensor_->publish_state(this->config_path.c_str());
+            break;
+          case SERVED_PATH_JAVASCRIPT:
+            this->last_path_text_sensor_->publish_state("/config-decrypt.js");
+            break;
+          default:
+            break;
+        }
+      }
+    #endif
+  }
 
   /**
    * @brief Sets the encryption type (if any) used to secure the config backup.
@@ -79,6 +178,30 @@ class ConfigBackup : public esphome::Component, public AsyncWebHandler {
     this->config_path = config_path;
   }
 
+  /**
+   * @brief Sets the entity tag sent with each response and matched against If-None-Match.
+   * @param etag Quoted ETag value, unique to this build's embedded payloads.
+   */
+  void set_etag(String etag) {
+    this->etag = etag;
+  }
+
+  #ifdef USE_SENSOR
+    void set_config_requests_sensor(sensor::Sensor *sensor) { this->config_requests_sensor_ = sensor; }
+    void set_javascript_requests_sensor(sensor::Sensor *sensor) { this->javascript_requests_sensor_ = sensor; }
+    void set_not_modified_sensor(sensor::Sensor *sensor) { this->not_modified_sensor_ = sensor; }
+    void set_bytes_sent_sensor(sensor::Sensor *sensor) { this->bytes_sent_sensor_ = sensor; }
+    void set_last_duration_sensor(sensor::Sensor *sensor) { this->last_duration_sensor_ = sensor; }
+    void set_max_duration_sensor(sensor::Sensor *sensor) { this->max_duration_sensor_ = sensor; }
+    void set_active_transfers_sensor(sensor::Sensor *sensor) { this->active_transfers_sensor_ = sensor; }
+  #endif
+
+  #ifdef USE_TEXT_SENSOR
+    void set_encryption_text_sensor(text_sensor::TextSensor *sensor) { this->encryption_text_sensor_ = sensor; }
+    void set_compression_text_sensor(text_sensor::TextSensor *sensor) { this->compression_text_sensor_ = sensor; }
+    void set_last_path_text_sensor(text_sensor::TextSensor *sensor) { this->last_path_text_sensor_ = sensor; }
+  #endif
+
   /**
    * @brief Determines if this handler can manage the incoming request for the config data
    *        (or the decryption script if GUI support is enabled).
@@ -86,12 +209,17 @@ class ConfigBackup : public esphome::Component, public AsyncWebHandler {
    * @return True if the URL matches the config backup path or the decrypt script path, and method is GET.
    */
   bool canHandle(AsyncWebServerRequest *request) override {
-    return (
+    if (!((
       request->url() == this->config_path
       #ifndef ESPHOME_CONFIG_BACKUP_NOJS
         || request->url() == "/config-decrypt.js"
       #endif
-    ) && request->method() == HTTP_GET;
+    ) && request->method() == HTTP_GET))
+      return false;
+
+    // The async web server drops any header not registered here before handleRequest() runs.
+    request->addInterestingHeader("If-None-Match");
+    return true;
   }
 
   /**
@@ -99,8 +227,15 @@ class ConfigBackup : public esphome::Component, public AsyncWebHandler {
    * @param request The request to be served.
    */
   void handleRequest(AsyncWebServerRequest *request) override {
+    const uint32_t start = micros();
+
     // Serve the Base64-encoded config data
     if (request->url() == this->config_path) {
+      this->config_requests_++;
+      this->last_path_ = SERVED_PATH_CONFIG;
+      if (this->send_not_modified_(request, start))
+        return;
+
       AsyncWebServerResponse *response = request->beginResponse_P(
         200, "text/plain", CONFIG_B64, CONFIG_B64_SIZE
       );
@@ -114,19 +249,24 @@ class ConfigBackup : public esphome::Component, public AsyncWebHandler {
       // Include compression metadata
       response->addHeader("X-Compression-Type", this->compression);
 
-      request->send(response);
+      this->send_tracked_(request, response, CONFIG_B64_SIZE, start);
     }
 
     #ifndef ESPHOME_CONFIG_BACKUP_NOJS
     // Serve the decryption script
     else if (request->url() == "/config-decrypt.js") {
+      this->javascript_requests_++;
+      this->last_path_ = SERVED_PATH_JAVASCRIPT;
+      if (this->send_not_modified_(request, start))
+        return;
+
       AsyncWebServerResponse *response = request->beginResponse_P(
         200, "application/javascript", CONFIG_DECRYPT_JS, CONFIG_DECRYPT_JS_SIZE
       );
 
       // Indicate gzip compression of the JavaScript
       response->addHeader("Content-Encoding", "gzip");
-      request->send(response);
+      this->send_tracked_(request, response, CONFIG_DECRYPT_JS_SIZE, start);
     }
     #endif
   }
@@ -138,10 +278,113 @@ class ConfigBackup : public esphome::Component, public AsyncWebHandler {
   bool isRequestHandlerTrivial() override { return true; }
 
  protected:
+  /**
+   * @brief Checks an If-None-Match header against this build's ETag (RFC 9110 weak comparison).
+   * @param header The header value: "*" or a comma-separated list of (optionally W/-prefixed) tags.
+   * @return True if the header matches the current ETag.
+   */
+  bool etag_matches_(const String &header) const {
+    String list = header;
+    list.trim();
+    if (list == "*")
+      return true;
+
+    String own = this->etag;
+    if (own.startsWith("W/"))
+      own = own.substring(2);
+
+    int pos = 0;
+    while (pos <= (int) list.length()) {
+      int comma = list.indexOf(',', pos);
+      if (comma < 0)
+        comma = list.length();
+      String tag = list.substring(pos, comma);
+      tag.trim();
+      if (tag.startsWith("W/"))
+        tag = tag.substring(2);
+      if (tag == own)
+        return true;
+      pos = comma + 1;
+    }
+    return false;
+  }
+
+  /**
+   * @brief Answers with 304 Not Modified if the client already holds this build's payload.
+   * @param request The request to be served.
+   * @param start micros() timestamp taken when the handler started serving the request.
+   * @return True if a 304 response was sent.
+   */
+  bool send_not_modified_(AsyncWebServerRequest *request, uint32_t start) {
+    if (this->etag.isEmpty() || !request->hasHeader("If-None-Match"))
+      return false;
+    if (!this->etag_matches_(request->getHeader("If-None-Match")->value()))
+      return false;
+
+    this->not_modified_++;
+    this->send_tracked_(request, request->beginResponse(304), 0, start);
+    return true;
+  }
+
+  /**
+   * @brief Sends a response and records its payload size and how long the transfer keeps the connection busy.
+   *
+   * The async web server streams the body after handleRequest() returns, so the transfer
+   * is only considered finished once the client disconnects.
+   * @param request The request to be served.
+   * @param response The prepared response.
+   * @param size Payload size in bytes, counted when queued (aborted transfers are still included).
+   * @param start micros() timestamp taken when the handler started serving the request.
+   */
+  void send_tracked_(AsyncWebServerRequest *request, AsyncWebServerResponse *response, size_t size, uint32_t start) {
+    if (!this->etag.isEmpty())
+      response->addHeader("ETag", this->etag);
+
+    this->active_transfers_++;
+    request->onDisconnect([this, start]() {
+      const uint32_t elapsed = micros() - start;
+      this->last_duration_us_ = elapsed;
+      uint32_t max = this->max_duration_us_.load();
+      while (elapsed > max && !this->max_duration_us_.compare_exchange_weak(max, elapsed)) {
+      }
+      this->active_transfers_--;
+    });
+
+    this->bytes_sent_ += size;
+    request->send(response);
+  }
+
   WebServerBase *base_;  ///< Pointer to the main web server base.
   String encryption;      ///< Encryption method used for the config data.
   String compression;
   String config_path;
+  String etag;            ///< ETag for this build's payloads (empty disables conditional requests).
+
+  // Counters are updated from the web server's task and read from the main loop.
+  std::atomic<uint32_t> config_requests_{0};
+  std::atomic<uint32_t> javascript_requests_{0};
+  std::atomic<uint32_t> not_modified_{0};
+  std::atomic<uint32_t> bytes_sent_{0};
+  std::atomic<uint32_t> last_duration_us_{0};
+  std::atomic<uint32_t> max_duration_us_{0};
+  std::atomic<uint32_t> active_transfers_{0};
+  std::atomic<uint8_t> last_path_{SERVED_PATH_NONE};
+
+  #ifdef USE_SENSOR
+    sensor::Sensor *config_requests_sensor_{nullptr};
+    sensor::Sensor *javascript_requests_sensor_{nullptr};
+    sensor::Sensor *not_modified_sensor_{nullptr};
+    sensor::Sensor *bytes_sent_sensor_{nullptr};
+    sensor::Sensor *last_duration_sensor_{nullptr};
+    sensor::Sensor *max_duration_sensor_{nullptr};
+    sensor::Sensor *active_transfers_sensor_{nullptr};
+  #endif
+
+  #ifdef USE_TEXT_SENSOR
+    text_sensor::TextSensor *encryption_text_sensor_{nullptr};
+    text_sensor::TextSensor *compression_text_sensor_{nullptr};
+    text_sensor::TextSensor *last_path_text_sensor_{nullptr};
+  #endif
 };
 
 }  // namespace config_backup
@@ -0,0 +1,102 @@
+import esphome.codegen as cg
+import esphome.config_validation as cv
+from esphome.components import sensor
+from esphome.const import (
+    DEVICE_CLASS_DATA_SIZE,
+    DEVICE_CLASS_DURATION,
+    ENTITY_CATEGORY_DIAGNOSTIC,
+    ICON_TIMER,
+    STATE_CLASS_MEASUREMENT,
+    STATE_CLASS_TOTAL_INCREASING,
+    UNIT_BYTES,
+    UNIT_MILLISECOND,
+)
+
+from . import CONF_CONFIG_BACKUP_ID, ConfigBackup
+
+DEPENDENCIES = ["config_backup"]
+
+# Configuration Constants
+CONF_CONFIG_REQUESTS = "config_requests"
+CONF_JAVASCRIPT_REQUESTS = "javascript_requests"
+CONF_NOT_MODIFIED = "not_modified"
+CONF_BYTES_SENT = "bytes_sent"
+CONF_LAST_DURATION = "last_duration"
+CONF_MAX_DURATION = "max_duration"
+CONF_ACTIVE_TRANSFERS = "active_transfers"
+
+ICON_DOWNLOAD = "mdi:download"
+ICON_TRANSFER = "mdi:transfer"
+
+CONFIG_SCHEMA = cv.Schema({
+    cv.GenerateID(CONF_CONFIG_BACKUP_ID): cv.use_id(ConfigBackup),
+    cv.Optional(CONF_CONFIG_REQUESTS): sensor.sensor_schema(
+        icon=ICON_DOWNLOAD,
+        accuracy_decimals=0,
+        state_class=STATE_CLASS_TOTAL_INCREASING,
+        entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+    ),
+    cv.Optional(CONF_JAVASCRIPT_REQUESTS): sensor.sensor_schema(
+        icon=ICON_DOWNLOAD,
+        accuracy_decimals=0,
+        state_class=STATE_CLASS_TOTAL_INCREASING,
+        entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+    ),
+    cv.Optional(CONF_NOT_MODIFIED): sensor.sensor_schema(
+        icon=ICON_DOWNLOAD,
+        accuracy_decimals=0,
+        state_class=STATE_CLASS_TOTAL_INCREASING,
+        entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+    ),
+    cv.Optional(CONF_BYTES_SENT): sensor.sensor_schema(
+        unit_of_measurement=UNIT_BYTES,
+        accuracy_decimals=0,
+        device_class=DEVICE_CLASS_DATA_SIZE,
+        state_class=STATE_CLASS_TOTAL_INCREASING,
+        entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+    ),
+    cv.Optional(CONF_LAST_DURATION): sensor.sensor_schema(
+        unit_of_measurement=UNIT_MILLISECOND,
+        icon=ICON_TIMER,
+        accuracy_decimals=1,
+        device_class=DEVICE_CLASS_DURATION,
+        state_class=STATE_CLASS_MEASUREMENT,
+        entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+    ),
+    cv.Optional(CONF_MAX_DURATION): sensor.sensor_schema(
+        unit_of_measurement=UNIT_MILLISECOND,
+        icon=ICON_TIMER,
+        accuracy_decimals=1,
+        device_class=DEVICE_CLASS_DURATION,
+        state_class=STATE_CLASS_MEASUREMENT,
+        entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+    ),
+    cv.Optional(CONF_ACTIVE_TRANSFERS): sensor.sensor_schema(
+        icon=ICON_TRANSFER,
+        accuracy_decimals=0,
+        state_class=STATE_CLASS_MEASUREMENT,
+        entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+    ),
+})
+
+SENSORS = [
+    CONF_CONFIG_REQUESTS,
+    CONF_JAVASCRIPT_REQUESTS,
+    CONF_NOT_MODIFIED,
+    CONF_BYTES_SENT,
+    CONF_LAST_DURATION,
+    CONF_MAX_DURATION,
+    CONF_ACTIVE_TRANSFERS,
+]
+
+
+async def to_code(config):
+    """
+    Attach the requested metric sensors to the config_backup component,
+    which publishes them on its update interval.
+    """
+    parent = await cg.get_variable(config[CONF_CONFIG_BACKUP_ID])
+    for key in SENSORS:
+        if key in config:
+            sens = await sensor.new_sensor(config[key])
+            cg.add(getattr(parent, f"set_{key}_sensor")(sens))
@@ -0,0 +1,44 @@
+import esphome.codegen as cg
+import esphome.config_validation as cv
+from esphome.components import text_sensor
+from esphome.const import ENTITY_CATEGORY_DIAGNOSTIC
+
+from . import CONF_COMPRESS, CONF_CONFIG_BACKUP_ID, CONF_ENCRYPTION, ConfigBackup
+
+DEPENDENCIES = ["config_backup"]
+
+# Configuration Constants
+CONF_LAST_PATH = "last_path"
+
+CONFIG_SCHEMA = cv.Schema({
+    cv.GenerateID(CONF_CONFIG_BACKUP_ID): cv.use_id(ConfigBackup),
+    cv.Optional(CONF_ENCRYPTION): text_sensor.text_sensor_schema(
+        icon="mdi:lock",
+        entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+    ),
+    cv.Optional(CONF_COMPRESS): text_sensor.text_sensor_schema(
+        icon="mdi:zip-box",
+        entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+    ),
+    cv.Optional(CONF_LAST_PATH): text_sensor.text_sensor_schema(
+        icon="mdi:web",
+        entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+    ),
+})
+
+TEXT_SENSORS = [
+    CONF_ENCRYPTION,
+    CONF_COMPRESS,
+    CONF_LAST_PATH,
+]
+
+
+async def to_code(config):
+    """
+    Attach the requested informational text sensors to the config_backup component.
+    """
+    parent = await cg.get_variable(config[CONF_CONFIG_BACKUP_ID])
+    for key in TEXT_SENSORS:
+        if key in config:
+            sens = await text_sensor.new_text_sensor(config[key])
+            cg.add(getattr(parent, f"set_{key}_text_sensor")(sens))